@@ -1,42 +1,80 @@
 import wx
-from typing import Dict, List, Callable
+import wx.lib.newevent
+from wx.lib.wordwrap import wordwrap
+from typing import Dict, List, Callable, Optional, Sequence, Tuple
 import threading
-import json
+import time
+from pathlib import Path
 import pprint
 import requests
-import json
-from dataclasses import dataclass
+import orjson
+from dataclasses import dataclass, replace
 from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
 import pprint
-import copy
+from contextlib import contextmanager
+import logging
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+_COL_WHITE           = wx.Colour(255, 255, 255)
+_COL_LIGHT_BLUE      = wx.Colour(220, 230, 255)
+_COL_BUTTON          = wx.Colour(240, 240, 240)
+_COL_BUTTON_SELECTED = wx.Colour(100, 149, 237)  # Cornflower blue
+
+@dataclass(frozen=True, slots=True)
 class ClockifyConfig:
     api_key      : str
     workspace_id : str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClockifyTask:
     id   : str
     name : str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClockifyProject:
     id   : str
     name : str
-    tasks : list[ClockifyTask]
+    tasks : tuple[ClockifyTask, ...]
 
 def read_config(config_file_path):
-    with open(config_file_path, "r") as f:
-         data = json.load(f)
+    with open(config_file_path, "rb") as f:
+         data = orjson.loads(f.read())
     return ClockifyConfig(**data)
 
 class Clockify:
     BASE_URL = "https://api.clockify.me/api/v1"
+    POOL_SIZE = 32              # Keep-alive connections to the Clockify API
+    TASK_FETCH_WORKERS = 16     # Concurrent per-project task requests
 
     def __init__(self, config: ClockifyConfig):
         self._config      = config
+        self._session     = self.new_session(config.api_key)
+
+    @classmethod
+    def new_session(cls, api_key: Optional[str] = None, max_backoff: Optional[float] = None):
+        """Create a session with pooled keep-alive connections and retries for the Clockify API.
+
+        max_backoff caps the wait between retries, and stops a server's Retry-After from
+        overriding it, for callers that can't afford to stall.
+        """
+        session = requests.Session()
+        if api_key is not None:
+            session.headers.update({'X-Api-Key': api_key})
+        # POST is left out: retrying a time entry creation after a 5xx could start a duplicate timer.
+        # raise_on_status=False hands the last response back once retries run out, so callers'
+        # status code checks still see it rather than a RetryError.
+        retry_kwargs = {}
+        if max_backoff is not None:
+            retry_kwargs = {'backoff_max': max_backoff, 'respect_retry_after_header': False}
+        retries = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(['GET', 'PUT']), raise_on_status=False, **retry_kwargs)
+        session.mount("https://", HTTPAdapter(pool_connections=cls.POOL_SIZE, pool_maxsize=cls.POOL_SIZE, max_retries=retries))
+        return session
 
     def get_projects(self):
         projects_list = []
@@ -44,38 +82,55 @@ class Clockify:
         while True:
             page += 1 
             
-            url = f'https://api.clockify.me/api/v1/workspaces/{self._config.workspace_id}/projects?page={page}&page-size=5000&archived=false'            
-            response = requests.get(url, headers={'X-Api-Key': self._config.api_key})
-
-            if response.status_code == HTTPStatus.OK:
-                projects_this_page = response.json()
-                if (len(projects_this_page) > 0):
-                    projects_list.extend([ClockifyProject(id=project['id'], name=project['name'], tasks=self._get_project_tasks(project['id'])) for project in projects_this_page])
-                else:
-                    break
-            else:
-                raise RuntimeError(f"Failed to get projects: {response.reason}\nResponse contents:\n{response.text.decode()}")
+            # Hydrated projects include their tasks, saving a request per project
+            url = f'{self.BASE_URL}/workspaces/{self._config.workspace_id}/projects?page={page}&page-size=5000&archived=false&hydrated=true'
+            response = self._session.get(url)
+
+            if response.status_code != HTTPStatus.OK:
+                raise RuntimeError(f"Failed to get projects: {response.reason}\nResponse contents:\n{response.text}")
+
+            # Parse straight from the raw bytes, then let them go rather than holding
+            # them alongside the parsed page while the projects are built
+            projects_this_page = orjson.loads(response.content)
+            del response
+            if not projects_this_page:
+                break
+
+            # Fall back to one request per project for any that came back without tasks,
+            # overlapping them rather than waiting on each in turn
+            missing_ids = [project['id'] for project in projects_this_page if 'tasks' not in project]
+            fetched_tasks = {}
+            if missing_ids:
+                with ThreadPoolExecutor(max_workers=self.TASK_FETCH_WORKERS) as executor:
+                    fetched_tasks = dict(zip(missing_ids, executor.map(self._get_project_tasks, missing_ids)))
+
+            projects_list.extend(
+                ClockifyProject(id=project['id'], name=project['name'],
+                                tasks=self._parse_tasks(project['tasks']) if 'tasks' in project else fetched_tasks[project['id']])
+                for project in projects_this_page)
             
         return projects_list
 
     def _get_project_tasks(self, project_id : str):
         # Doubt there'l be more than 5000 tasks for a project so just use 1st page!
         url = f"{self.BASE_URL}/workspaces/{self._config.workspace_id}/projects/{project_id}/tasks?page=1&page-size=5000"
-        response = requests.get(url, headers={
-            "X-Api-Key": self._config.api_key,
-            "Content-Type": "application/json"
-        })
+        response = self._session.get(url, headers={"Content-Type": "application/json"})
 
         if response.status_code != HTTPStatus.OK:
-            raise RuntimeError(f"Failed to get tasks for project '{project_id}': {response.reason}\nResponse contents:\n{response.text.decode()}")
+            raise RuntimeError(f"Failed to get tasks for project '{project_id}': {response.reason}\nResponse contents:\n{response.text}")
 
-        tasks = response.json()
+        return self._parse_tasks(orjson.loads(response.content))
 
-        return [ClockifyTask(id=task['id'], name=task['name']) for task in tasks]
+    @staticmethod
+    def _parse_tasks(tasks):
+        return tuple(ClockifyTask(id=task['id'], name=task['name']) for task in tasks)
 
 
 
 class GetProjectsAndTasks(threading.Thread):
+    CACHE_DIR = Path.home() / ".cache" / "clockifykeypad"
+    CACHE_TTL = 60 * 60  # Seconds a cached project list is still shown at startup
+
     def __init__(self, cb, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._cb = cb
@@ -83,73 +138,169 @@ class GetProjectsAndTasks(threading.Thread):
     def run(self):
         print("Running thread")
         clockify_cfg = read_config("config.json")
+        cache_file = self.CACHE_DIR / f"projects-{clockify_cfg.workspace_id}.json"
+
+        # Show the last fetched projects straight away, then replace them with fresh ones
+        cached_projects = self._load_cache(cache_file)
+        if cached_projects is not None:
+            self._cb(cached_projects)
+
         clockify = Clockify(clockify_cfg)
         myprojects = clockify.get_projects()
         self._cb(myprojects)
+        self._save_cache(cache_file, myprojects)
+
+    def _load_cache(self, cache_file: Path) -> Optional[List[ClockifyProject]]:
+        try:
+            if time.time() - cache_file.stat().st_mtime > self.CACHE_TTL:
+                return None
+            data = orjson.loads(cache_file.read_bytes())
+            return [ClockifyProject(id=project['id'], name=project['name'], tasks=tuple(ClockifyTask(**task) for task in project['tasks'])) for project in data]
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+            return None
 
+    def _save_cache(self, cache_file: Path, projects: List[ClockifyProject]):
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a reader never sees a partial file
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_bytes(orjson.dumps(projects))
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            logger.warning("Failed to write project cache '%s': %s", cache_file, e)
 
 
+
+@dataclass(frozen=True, slots=True)
+class _ProjectCatalog:
+    """Projects plus their lookup indexes, published as one reference so readers need no lock"""
+    projects      : Tuple[ClockifyProject, ...]
+    project_index : Dict[str, int]                       # project id -> position in projects
+    task_index    : Dict[Tuple[str, str], ClockifyTask]  # (project id, task id) -> task
+
+    @classmethod
+    def build(cls, projects: Sequence[ClockifyProject]):
+        projects = tuple(projects)
+        return cls(projects=projects,
+                   project_index={project.id: i for i, project in enumerate(projects)},
+                   task_index={(project.id, task.id): task for project in projects for task in project.tasks})
+
 class Model:
     """Model class that holds project and task data"""
     
     def __init__(self):
-        self._observers: List[Callable] = []
-        self._projects = []
+        # Keyed by the callback itself so add/remove are O(1) and keep insertion order
+        self._observers: Dict[Callable, Callable] = {}
+        # Never mutated, only replaced. Rebinding an attribute is atomic, so readers
+        # just take the current reference.
+        self._catalog = _ProjectCatalog.build(())
+        # Writers read-modify-swap the catalog from both the fetch and GUI threads, so
+        # they take this lock. Readers never do.
+        self._write_lock = threading.Lock()
+        self._batch_depth = 0
+        self._pending_notify = False
         self._api_thread = GetProjectsAndTasks(self.cb)
-        self._mutex = threading.Lock()
+
+    def start(self):
+        """Start fetching projects in the background. Observers are notified when they arrive."""
         self._api_thread.start()
 
     def cb(self, projects):
-        with self._mutex:
-            self._projects = projects
-        
+        catalog = _ProjectCatalog.build(projects)
+        with self._write_lock:
+            self._catalog = catalog
         self.notify_observers()
 
     def add_observer(self, callback: Callable):
         """Add observer callback for model updates"""
-        self._observers.append(callback)
+        self._observers[callback] = callback
     
     def remove_observer(self, callback: Callable):
         """Remove observer callback"""
-        if callback in self._observers:
-            self._observers.remove(callback)
+        self._observers.pop(callback, None)
+    
+    @contextmanager
+    def batch(self):
+        """Defer notifications until the outermost batch exits, then notify once"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_notify:
+                self._pending_notify = False
+                self.notify_observers()
     
     def notify_observers(self):
         """Notify all observers of model changes"""
+        if self._batch_depth > 0:
+            self._pending_notify = True
+            return
+        
         print("NOTIFY")
-        for callback in self._observers:
-            callback()
+        # Snapshot so observers can add/remove themselves while being notified.
+        # Callbacks are queued on the GUI event loop rather than run in place.
+        for callback in tuple(self._observers.values()):
+            wx.CallAfter(callback)
     
-    def get_projects(self) -> List[str]:
+    def get_projects(self) -> Tuple[ClockifyProject, ...]:
         """Get list of all projects"""
-        project_copy = None
-        with self._mutex:
-            project_copy = copy.deepcopy(self._projects)
-        return project_copy
+        # Projects are frozen and held in a tuple, so they can be shared without copying
+        return self._catalog.projects
+    
+    def get_project(self, project_id: str) -> Optional[ClockifyProject]:
+        """Get a project by id"""
+        catalog = self._catalog
+        i = catalog.project_index.get(project_id)
+        return None if i is None else catalog.projects[i]
+    
+    def get_task(self, project_id: str, task_id: str) -> Optional[ClockifyTask]:
+        """Get a task by project and task id"""
+        return self._catalog.task_index.get((project_id, task_id))
     
-    def get_tasks_for_project(self, project) -> List[str]:
+    def get_tasks_for_project(self, project: ClockifyProject) -> Tuple[ClockifyTask, ...]:
         """Get tasks for a specific project"""
-        tasks_copy = None
-        with self._mutex:
-            tasks_copy = copy.deepcopy(project.tasks)
-        print(f"GOT TASKS {tasks_copy}")
-        return tasks_copy
+        # Look the project up by id, as the object passed in may be from an older snapshot.
+        # Tasks are stored as a tuple, so they can be handed out without copying.
+        project = self.get_project(project.id) or project
+        print(f"GOT TASKS {project.tasks}")
+        return project.tasks
     
-    def add_project(self, project: str, tasks: List[str] = None):
+    def add_project(self, project: ClockifyProject):
         """Add a new project with tasks"""
-        if tasks is None:
-            tasks = []
-        self._projects_data[project] = tasks
+        with self._write_lock:
+            projects = self._catalog.projects
+            self._catalog = _ProjectCatalog.build(projects + (replace(project, tasks=tuple(project.tasks)),))
         self.notify_observers()
     
-    def update_project_tasks(self, project: str, tasks: List[str]):
+    def update_project_tasks(self, project_id: str, tasks: Sequence[ClockifyTask]):
         """Update tasks for an existing project"""
-        if project in self._projects_data:
-            self._projects_data[project] = tasks
-            self.notify_observers()
+        with self._write_lock:
+            catalog = self._catalog
+            i = catalog.project_index.get(project_id)
+            if i is None:
+                return
+            project = replace(catalog.projects[i], tasks=tuple(tasks))
+            self._catalog = _ProjectCatalog.build(catalog.projects[:i] + (project,) + catalog.projects[i + 1:])
+        self.notify_observers()
+
+# Events posted by MainView for the Presenter to handle
+ProjectSelectedEvent, EVT_PROJECT_SELECTED = wx.lib.newevent.NewEvent()
+TaskSelectedEvent, EVT_TASK_SELECTED       = wx.lib.newevent.NewEvent()
+SaveClickedEvent, EVT_SAVE_CLICKED         = wx.lib.newevent.NewEvent()
+ExitClickedEvent, EVT_EXIT_CLICKED         = wx.lib.newevent.NewEvent()
 
 class MainView(wx.Frame):
     """View class - handles GUI display and user interactions"""
+
+    # Keypad grid layout, in pixels
+    GRID_ROWS    = 2
+    GRID_COLS    = 3
+    CELL_WIDTH   = 120
+    CELL_HEIGHT  = 100
+    CELL_SPACING = 10
+    CELL_PADDING = 5
+    STOP_CELL    = 5    # 6th key stops any task and is not selectable
     
     def __init__(self):
         super().__init__(None, title="MVP GUI Application", size=(800, 400))
@@ -160,42 +311,34 @@ class MainView(wx.Frame):
         # Create main sizer
         main_sizer = wx.BoxSizer(wx.HORIZONTAL)
         
-        # Left side - Grid of text panels
-        left_sizer = wx.GridSizer(2, 3, 10, 10)  # 2 rows, 3 cols, 10px spacing
+        # Left side - Grid of keypad cells, all drawn by a single panel
+        pitch_x = self.CELL_WIDTH + self.CELL_SPACING
+        pitch_y = self.CELL_HEIGHT + self.CELL_SPACING
+        self.grid_panel = wx.Panel(panel, size=(self.GRID_COLS * pitch_x - self.CELL_SPACING,
+                                                self.GRID_ROWS * pitch_y - self.CELL_SPACING))
+        # Everything is painted in on_paint_grid, so skip the native background erase
+        self.grid_panel.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.grid_panel.SetFont(App.FONT_LABEL)
+        self._grid_background = wx.Brush(self.grid_panel.GetBackgroundColour())
+        self._cells = [wx.Rect(col * pitch_x, row * pitch_y, self.CELL_WIDTH, self.CELL_HEIGHT)
+                       for row in range(self.GRID_ROWS) for col in range(self.GRID_COLS)]
+        self._text_rects = [wx.Rect(cell).Deflate(self.CELL_PADDING) for cell in self._cells]
         
-        # Create 6 text panels
-        self.text_panels = []
-        self.text_labels = []  # Store references to labels
         self.panel_data  = [None, None, None, None, None, None]
-        self.selected_panel = None
+        self.panel_texts = ["", "", "", "", "", "Stop any task"]  # Unwrapped label text
+        self._wrapped_texts = [None] * len(self.panel_texts)     # Wrapped on first paint
         self.selected_panel_index = None
+        self._border_bitmaps = {}  # (style, width, height) -> wx.Bitmap
         
-        for i in range(6):
-            text_panel = wx.Panel(panel, size=(120, 100))
-            text_panel.SetBackgroundColour(wx.Colour(255, 255, 255))
-            
-            # Add "Text" label
-            text_sizer = wx.BoxSizer(wx.VERTICAL)
-            if i < 5:
-                text_label = wx.StaticText(text_panel, label="")
-            else:
-                text_label = wx.StaticText(text_panel, label="Stop any task")
-            text_label.SetFont(wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
-            text_sizer.Add(text_label, 1, wx.CENTER | wx.ALL | wx.EXPAND, 5)
-            text_panel.SetSizer(text_sizer)
-            
-            # Make panels clickable
-            if i < 5:
-                # 6th box not selectable
-                text_panel.Bind(wx.EVT_LEFT_DOWN, lambda evt, panel_idx=i: self.on_panel_click(evt, panel_idx))
-                text_label.Bind(wx.EVT_LEFT_DOWN, lambda evt, panel_idx=i: self.on_panel_click(evt, panel_idx))
-            
-            # Draw border
-            text_panel.Bind(wx.EVT_PAINT, lambda evt, panel=text_panel, is_red=(i==5): self.on_paint_panel(evt, panel, is_red))
-            
-            self.text_panels.append(text_panel)
-            self.text_labels.append(text_label)  # Store label reference
-            left_sizer.Add(text_panel, 0, wx.EXPAND)
+        # Panel border styles: (background colour, border pen)
+        self._border_styles = {
+            "selected" : (_COL_LIGHT_BLUE, App.PEN_SELECTED),  # Blue border for selected
+            "red"      : (_COL_WHITE, App.PEN_RED),            # Red border for panel 6
+            "normal"   : (_COL_WHITE, App.PEN_BLACK),          # Black border for others
+        }
+        
+        self.grid_panel.Bind(wx.EVT_PAINT, self.on_paint_grid)
+        self.grid_panel.Bind(wx.EVT_LEFT_DOWN, self.on_panel_click)
         
         # Right side - Controls
         right_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -221,8 +364,8 @@ class MainView(wx.Frame):
         
         # Button state tracking
         self.selected_button = None
-        self.save_btn.SetBackgroundColour(wx.Colour(240, 240, 240))
-        self.exit_btn.SetBackgroundColour(wx.Colour(240, 240, 240))
+        self.save_btn.SetBackgroundColour(_COL_BUTTON)
+        self.exit_btn.SetBackgroundColour(_COL_BUTTON)
         
         button_sizer.Add(self.save_btn, 0, wx.RIGHT, 10)
         button_sizer.Add(self.exit_btn, 0)
@@ -233,7 +376,7 @@ class MainView(wx.Frame):
         right_sizer.Add(button_sizer, 0, wx.ALIGN_LEFT)
         
         # Add left and right to main sizer
-        main_sizer.Add(left_sizer, 1, wx.EXPAND | wx.ALL, 20)
+        main_sizer.Add(self.grid_panel, 1, wx.ALL, 20)
         main_sizer.Add(right_sizer, 0, wx.EXPAND | wx.ALL, 20)
         
         panel.SetSizer(main_sizer)
@@ -241,31 +384,79 @@ class MainView(wx.Frame):
         # Bind events
         self.save_btn.Bind(wx.EVT_BUTTON, self.on_save_click)
         self.exit_btn.Bind(wx.EVT_BUTTON, self.on_exit_click)
+        for button in (self.save_btn, self.exit_btn):
+            # Only these buttons get idle-time UI updates (see App.OnInit)
+            button.SetExtraStyle(button.GetExtraStyle() | wx.WS_EX_PROCESS_UI_UPDATES)
+            button.Bind(wx.EVT_UPDATE_UI, self.on_update_button_ui)
         self.project_combo.Bind(wx.EVT_COMBOBOX, self.on_project_change)
         self.task_combo.Bind(wx.EVT_COMBOBOX, self.on_task_change)
         
+        # (id, name) of the items last put in each dropdown, to skip no-op refreshes
+        self._projects_sig = None
+        self._tasks_sig    = None
+        
         # Center the frame
         self.Center()
-        
-        # Presenter will be set externally
-        self.presenter = None
-    
-    def set_presenter(self, presenter):
-        """Set the presenter for this view"""
-        self.presenter = presenter
     
-    def populate_projects(self, projects: List):
+    def populate_projects(self, projects: Sequence):
         """Populate the project dropdown"""
-        self.project_combo.Clear()
-        for project in projects:
-            self.project_combo.Append(project.name, clientData=project)
-        
-    def populate_tasks(self, tasks: List):
-        """Populate the task dropdown"""
-        self.task_combo.Clear()
-        for task in tasks:
-            print(f"APPEND {task.name}")
-            self.task_combo.Append(task.name, clientData=task)
+        signature = tuple((project.id, project.name) for project in projects)
+        if signature != self._projects_sig:
+            self._projects_sig = signature
+            self._sync_combo(self.project_combo, projects)
+        
+    def populate_tasks(self, tasks: Sequence, keep_selection: bool = True):
+        """Populate the task dropdown. If not keep_selection, no task is left selected."""
+        signature = tuple((task.id, task.name) for task in tasks)
+        if signature != self._tasks_sig:
+            self._tasks_sig = signature
+            self._sync_combo(self.task_combo, tasks, keep_selection)
+        elif not keep_selection:
+            self.task_combo.SetSelection(wx.NOT_FOUND)
+
+    def _sync_combo(self, combo, items: Sequence, keep_selection: bool = True):
+        """Make combo list items (by name), touching only the entries that differ.
+        If keep_selection, the selected entry stays selected where its name is still listed."""
+        names = [item.name for item in items]
+        current = combo.GetStrings()
+
+        # Length of the common prefix, which can stay in place
+        keep = 0
+        for old_name, new_name in zip(current, names):
+            if old_name != new_name:
+                break
+            keep += 1
+
+        # The selection survives unless its entry is in the replaced tail
+        selection = combo.GetSelection()
+        restore = keep_selection and selection != wx.NOT_FOUND and selection >= keep
+        selected_name = current[selection] if restore else None
+
+        combo.Freeze()
+        try:
+            if keep == 0:
+                # Nothing in common, so replace every entry in one native call
+                combo.Set(names)
+            else:
+                for i in range(len(current) - 1, keep - 1, -1):
+                    combo.Delete(i)
+                if keep < len(names):
+                    combo.AppendItems(names[keep:])
+
+            # Client data may be a new object even when the name is unchanged
+            for i, item in enumerate(items):
+                combo.SetClientData(i, item)
+
+            if restore:
+                try:
+                    combo.SetSelection(names.index(selected_name, keep))
+                except ValueError:
+                    pass
+            elif not keep_selection:
+                # Kept prefix entries would otherwise stay selected
+                combo.SetSelection(wx.NOT_FOUND)
+        finally:
+            combo.Thaw()
     
     def get_selected_project(self) -> str:
         """Get currently selected project"""
@@ -288,99 +479,124 @@ class MainView(wx.Frame):
         return client_data
 
 
-    def on_panel_click(self, event, panel_index):
+    def on_panel_click(self, event):
         """Handle panel click - select and highlight"""
-        self.selected_panel = self.text_panels[panel_index]
+        position = event.GetPosition()
+        for panel_index, cell in enumerate(self._cells):
+            if cell.Contains(position):
+                break
+        else:
+            return
+        
+        if panel_index == self.STOP_CELL:
+            # 6th box not selectable
+            return
+        
+        previous_index = self.selected_panel_index
+        if previous_index == panel_index:
+            # Already selected, so nothing looks any different
+            return
         self.selected_panel_index = panel_index
         
-        # Update panel backgrounds and refresh
-        for i, panel in enumerate(self.text_panels):
-            if panel == self.selected_panel:
-                panel.SetBackgroundColour(wx.Colour(220, 230, 255))  # Light blue background
-            else:
-                panel.SetBackgroundColour(wx.Colour(255, 255, 255))  # White background
-            panel.Refresh()
+        # Only the previously selected and newly selected panels need repainting
+        if previous_index is not None:
+            self.grid_panel.RefreshRect(self._cells[previous_index], eraseBackground=False)
+        self.grid_panel.RefreshRect(self._cells[panel_index], eraseBackground=False)
         
-        print(f"Panel {panel_index + 1} selected!")  # Debug message
+        logger.debug("Panel %d selected!", panel_index + 1)
     
-    def on_paint_panel(self, event, panel, is_red=False):
-        """Draw border around panels"""
-        dc = wx.PaintDC(panel)
+    def on_paint_grid(self, event):
+        """Draw panel borders and labels for every keypad cell"""
+        dc = wx.AutoBufferedPaintDC(self.grid_panel)
+        dc.SetBackground(self._grid_background)
         dc.Clear()
-        
-        size = panel.GetSize()
-        
-        # Determine border color and width
-        if panel == self.selected_panel:
-            dc.SetPen(wx.Pen(wx.Colour(0, 0, 255), 3))  # Blue border for selected
-        elif is_red:
-            dc.SetPen(wx.Pen(wx.Colour(255, 0, 0), 2))  # Red border for panel 6
-        else:
-            dc.SetPen(wx.Pen(wx.Colour(0, 0, 0), 2))    # Black border for others
-        
-        dc.SetBrush(wx.Brush(wx.Colour(255, 255, 255), wx.BRUSHSTYLE_TRANSPARENT))
-        dc.DrawRectangle(0, 0, size.width, size.height)
+        dc.SetFont(App.FONT_LABEL)
+        
+        for i, cell in enumerate(self._cells):
+            # Determine border style
+            if i == self.selected_panel_index:
+                style = "selected"
+            elif i == self.STOP_CELL:
+                style = "red"
+            else:
+                style = "normal"
+            
+            dc.DrawBitmap(self._get_border_bitmap(style, cell.GetSize()), cell.x, cell.y)
+            if self.panel_texts[i]:
+                # Wrapping measures the text, so only redo it when the text changes
+                if self._wrapped_texts[i] is None:
+                    self._wrapped_texts[i] = wordwrap(self.panel_texts[i], self._text_rects[i].width, dc)
+                # DrawLabel doesn't clip, so keep long labels inside their own cell
+                with wx.DCClipper(dc, self._text_rects[i]):
+                    dc.DrawLabel(self._wrapped_texts[i], self._text_rects[i], wx.ALIGN_LEFT | wx.ALIGN_TOP)
+
+    def _get_border_bitmap(self, style, size):
+        """Get a pre-rendered panel background and border, rendering it on first use"""
+        key = (style, size.width, size.height)
+        bitmap = self._border_bitmaps.get(key)
+        if bitmap is None:
+            background, pen = self._border_styles[style]
+            bitmap = wx.Bitmap(size.width, size.height)
+            dc = wx.MemoryDC(bitmap)
+            dc.SetBackground(wx.Brush(background))
+            dc.Clear()
+            dc.SetPen(pen)
+            dc.SetBrush(App.BRUSH_TRANSPARENT)
+            dc.DrawRectangle(0, 0, size.width, size.height)
+            dc.SelectObject(wx.NullBitmap)
+            self._border_bitmaps[key] = bitmap
+        return bitmap
     
     def on_project_change(self, event):
         """Handle project selection change"""
-        if self.presenter:
-            self.presenter.on_project_selected(self.get_selected_project())
+        wx.PostEvent(self, ProjectSelectedEvent(project=self.get_selected_project()))
     
     def on_task_change(self, event):
         """Handle task selection change"""
-        if self.presenter:
-            self.presenter.on_task_selected(self.get_selected_task())
+        wx.PostEvent(self, TaskSelectedEvent(task=self.get_selected_task()))
     
     def on_save_click(self, event):
         """Handle Save button click - select and execute"""
         self.selected_button = self.save_btn
-        self.highlight_selected_button()
-        
-        if self.presenter:
-            self.presenter.on_save_clicked()
+        wx.PostEvent(self, SaveClickedEvent())
     
     def on_exit_click(self, event):
         """Handle Exit button click - select and execute"""
         self.selected_button = self.exit_btn
-        self.highlight_selected_button()
-        
-        if self.presenter:
-            self.presenter.on_exit_clicked()
+        wx.PostEvent(self, ExitClickedEvent())
     
-    def highlight_selected_button(self):
-        """Highlight the selected button"""
-        # Reset both buttons to normal color
-        self.save_btn.SetBackgroundColour(wx.Colour(240, 240, 240))
-        self.exit_btn.SetBackgroundColour(wx.Colour(240, 240, 240))
+    def on_update_button_ui(self, event):
+        """Highlight the selected button, run by wx at idle time"""
+        button = event.GetEventObject()
+        colour = _COL_BUTTON_SELECTED if button is self.selected_button else _COL_BUTTON
         
-        # Highlight selected button
-        if self.selected_button:
-            self.selected_button.SetBackgroundColour(wx.Colour(100, 149, 237))  # Cornflower blue
-        
-        # Force refresh to show changes immediately
-        self.save_btn.Refresh()
-        self.exit_btn.Refresh()
+        if button.GetBackgroundColour() != colour:
+            button.SetBackgroundColour(colour)
+    
+    def show_button_highlight(self):
+        """Apply and paint the button highlight immediately instead of at idle time"""
+        for button in (self.save_btn, self.exit_btn):
+            button.UpdateWindowUI()
         self.Update()
     
     def update_selected_panel_text(self, project, task):
         """Update the selected panel's text"""
-        if self.selected_panel and self.selected_panel_index is not None:
+        if self.selected_panel_index is not None:
             # Combine project and task text
             combined_text = f"{project.name}\n{task.name}" if project and task else project.name or task.name or "Text"
             
-            label = self.text_labels[self.selected_panel_index]
-            label.SetLabel(combined_text)
-            label.Wrap(100)  # Wrap text to fit in panel
-            self.selected_panel.Layout()  # Refresh layout
+            if self.panel_texts[self.selected_panel_index] == combined_text:
+                return
+            self.panel_texts[self.selected_panel_index] = combined_text
+            self._wrapped_texts[self.selected_panel_index] = None
+            self.grid_panel.RefreshRect(self._cells[self.selected_panel_index], eraseBackground=False)
     
     def update_selected_button_text(self, project: str, task: str):
         """Update the selected button's text"""
         if self.selected_button:
             button_text = f"{project} - {task}" if project and task else project or task
-            if button_text:
+            if button_text and button_text != self.selected_button.GetLabel():
                 self.selected_button.SetLabel(button_text)
-                # Maintain highlighting after text change
-                self.highlight_selected_button()
     
     def show_save_message(self, project: str, task: str):
         """Show save confirmation message"""
@@ -392,16 +608,19 @@ class Presenter:
     def __init__(self, model: Model, view: MainView):
         self.model = model
         self.view = view
-        
-        # Set up bidirectional communication
-        self.view.set_presenter(self)
+        self._last_content = None     # Inputs of the last update_selected_content
+        self._last_project_id = None  # Project whose tasks are in the task dropdown
+        
+        # Listen to the view's events and the model's change notifications
+        self.view.Bind(EVT_PROJECT_SELECTED, lambda event: self.on_project_selected(event.project))
+        self.view.Bind(EVT_TASK_SELECTED, lambda event: self.on_task_selected(event.task))
+        self.view.Bind(EVT_SAVE_CLICKED, lambda event: self.on_save_clicked())
+        self.view.Bind(EVT_EXIT_CLICKED, lambda event: self.on_exit_clicked())
         self.model.add_observer(self.on_model_updated)
-        
-        # Initialize view with model data
-        self.on_model_updated()
     
     def on_model_updated(self):
         """Handle model updates - refresh view"""
+        self._last_content = None
         projects = self.model.get_projects()
         self.view.populate_projects(projects)
         
@@ -410,15 +629,21 @@ class Presenter:
         if selected_project:
             tasks = self.model.get_tasks_for_project(selected_project)
             self.view.populate_tasks(tasks)
+            self._last_project_id = selected_project.id
     
     def on_project_selected(self, project: str):
         """Handle project selection"""
         print(f"Projct {project} selected")
-        if project:
-            tasks = self.model.get_tasks_for_project(project)
-            self.view.populate_tasks(tasks)
-        else:
-            self.view.populate_tasks([])
+        # EVT_COMBOBOX can re-fire for the same item, so only repopulate tasks on a change
+        project_id = project.id if project else None
+        if project_id != self._last_project_id:
+            self._last_project_id = project_id
+            # A task picked under the previous project must not carry over by name
+            if project:
+                tasks = self.model.get_tasks_for_project(project)
+                self.view.populate_tasks(tasks, keep_selection=False)
+            else:
+                self.view.populate_tasks([], keep_selection=False)
         
         # Update selected content
         self.update_selected_content()
@@ -433,6 +658,12 @@ class Presenter:
         project = self.view.get_selected_project()
         task = self.view.get_selected_task()
         
+        # Nothing to do if the same selection was already written to the same panel/button
+        content = (self.view.selected_panel_index, self.view.selected_button, project, task)
+        if content == self._last_content:
+            return
+        self._last_content = content
+        
         # Update panel text
         self.view.update_selected_panel_text(project, task)
         
@@ -447,17 +678,37 @@ class Presenter:
     
     def on_exit_clicked(self):
         """Handle exit button click"""
-        # Small delay to show highlight before closing
-        wx.CallLater(100, self.view.Close)
+        # Paint the highlight now rather than waiting for idle, then close straight away
+        self.view.show_button_highlight()
+        self.view.Close()
 
 class App(wx.App):
+    # Shared GDI objects, created in OnInit as they need wx to be initialised
+    PEN_SELECTED      = None
+    PEN_RED           = None
+    PEN_BLACK         = None
+    BRUSH_TRANSPARENT = None
+    FONT_LABEL        = None
+    
     def OnInit(self):
+        App.PEN_SELECTED      = wx.Pen(wx.BLUE, 3)
+        App.PEN_RED           = wx.Pen(wx.RED, 2)
+        App.PEN_BLACK         = wx.Pen(wx.BLACK, 2)
+        App.BRUSH_TRANSPARENT = wx.TRANSPARENT_BRUSH
+        App.FONT_LABEL        = wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        
+        # Only send idle-time UI update events to windows that ask for them
+        wx.UpdateUIEvent.SetMode(wx.UPDATE_UI_PROCESS_SPECIFIED)
+        
         # Create Model, View, and Presenter
         model = Model()
         view = MainView()
         presenter = Presenter(model, view)
         
         view.Show()
+        
+        # Fetch only once the presenter is observing, so the first update isn't missed
+        model.start()
         return True
 
 if __name__ == '__main__':
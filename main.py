@@ -3,47 +3,49 @@ import requests
 from datetime import datetime, timezone
 import os
 import time
-import json
+import threading
+import orjson
 from dataclasses import dataclass, asdict
 from typing import Optional
 from enum import Enum
 from http import HTTPStatus
-import sys
-import pprint
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class Action(Enum):
     START_PROJ = "START_PROJ"
     STOP_ANY   = "STOP_ANY"    
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ButtonAction:
     description : str
     project_id  : str
     task_id     : str
     text        : Optional[str]
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClockifyConfig:
     api_key      : str
     workspace_id : str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClockifyTask:
     id   : str
     name : str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClockifyProject:
     id   : str
     name : str
-    tasks : list[ClockifyTask]
+    tasks : tuple[ClockifyTask, ...]
 
 #    project_id   : Optional[str]
 #    buttons      : Optional[dict[int, str]]
 
 def read_config(config_file_path):
-    with open(config_file_path, "r") as f:
-         data = json.load(f)
+    with open(config_file_path, "rb") as f:
+         data = orjson.loads(f.read())
     return ClockifyConfig(**data)
 
 
@@ -51,9 +53,33 @@ def read_config(config_file_path):
 
 class Clockify:
     BASE_URL = "https://api.clockify.me/api/v1"
+    POOL_SIZE = 32              # Keep-alive connections to the Clockify API
+    TASK_FETCH_WORKERS = 16     # Concurrent per-project task requests
 
     def __init__(self, config: ClockifyConfig):
         self._config      = config
+        self._session     = self.new_session(config.api_key)
+
+    @classmethod
+    def new_session(cls, api_key: Optional[str] = None, max_backoff: Optional[float] = None):
+        """Create a session with pooled keep-alive connections and retries for the Clockify API.
+
+        max_backoff caps the wait between retries, and stops a server's Retry-After from
+        overriding it, for callers that can't afford to stall.
+        """
+        session = requests.Session()
+        if api_key is not None:
+            session.headers.update({'X-Api-Key': api_key})
+        # POST is left out: retrying a time entry creation after a 5xx could start a duplicate timer.
+        # raise_on_status=False hands the last response back once retries run out, so callers'
+        # status code checks still see it rather than a RetryError.
+        retry_kwargs = {}
+        if max_backoff is not None:
+            retry_kwargs = {'backoff_max': max_backoff, 'respect_retry_after_header': False}
+        retries = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(['GET', 'PUT']), raise_on_status=False, **retry_kwargs)
+        session.mount("https://", HTTPAdapter(pool_connections=cls.POOL_SIZE, pool_maxsize=cls.POOL_SIZE, max_retries=retries))
+        return session
 
     def get_projects(self):
         projects_list = []
@@ -61,45 +87,59 @@ class Clockify:
         while True:
             page += 1 
             
-            url = f'https://api.clockify.me/api/v1/workspaces/{self._config.workspace_id}/projects?page={page}&page-size=5000&archived=false'            
-            response = requests.get(url, headers={'X-Api-Key': self._config.api_key})
-
-            if response.status_code == HTTPStatus.OK:
-                projects_this_page = response.json()
-                if (len(projects_this_page) > 0):
-                    projects_list.extend([ClockifyProject(id=project['id'], name=project['name'], tasks=self._get_project_tasks(project['id'])) for project in projects_this_page])
-                else:
-                    break
-            else:
-                raise RuntimeError(f"Failed to get projects: {response.reason}\nResponse contents:\n{response.text.decode()}")
+            # Hydrated projects include their tasks, saving a request per project
+            url = f'{self.BASE_URL}/workspaces/{self._config.workspace_id}/projects?page={page}&page-size=5000&archived=false&hydrated=true'
+            response = self._session.get(url)
+
+            if response.status_code != HTTPStatus.OK:
+                raise RuntimeError(f"Failed to get projects: {response.reason}\nResponse contents:\n{response.text}")
+
+            # Parse straight from the raw bytes, then let them go rather than holding
+            # them alongside the parsed page while the projects are built
+            projects_this_page = orjson.loads(response.content)
+            del response
+            if not projects_this_page:
+                break
+
+            # Fall back to one request per project for any that came back without tasks,
+            # overlapping them rather than waiting on each in turn
+            missing_ids = [project['id'] for project in projects_this_page if 'tasks' not in project]
+            fetched_tasks = {}
+            if missing_ids:
+                with ThreadPoolExecutor(max_workers=self.TASK_FETCH_WORKERS) as executor:
+                    fetched_tasks = dict(zip(missing_ids, executor.map(self._get_project_tasks, missing_ids)))
+
+            projects_list.extend(
+                ClockifyProject(id=project['id'], name=project['name'],
+                                tasks=self._parse_tasks(project['tasks']) if 'tasks' in project else fetched_tasks[project['id']])
+                for project in projects_this_page)
             
         return projects_list
 
     def _get_project_tasks(self, project_id : str):
         # Doubt there'l be more than 5000 tasks for a project so just use 1st page!
         url = f"{self.BASE_URL}/workspaces/{self._config.workspace_id}/projects/{project_id}/tasks?page=1&page-size=5000"
-        response = requests.get(url, headers={
-            "X-Api-Key": self._config.api_key,
-            "Content-Type": "application/json"
-        })
+        response = self._session.get(url, headers={"Content-Type": "application/json"})
 
         if response.status_code != HTTPStatus.OK:
-            raise RuntimeError(f"Failed to get tasks for project '{project_id}': {response.reason}\nResponse contents:\n{response.text.decode()}")
+            raise RuntimeError(f"Failed to get tasks for project '{project_id}': {response.reason}\nResponse contents:\n{response.text}")
 
-        tasks = response.json()
+        return self._parse_tasks(orjson.loads(response.content))
 
-        return [ClockifyTask(id=task['id'], name=task['name']) for task in tasks]
+    @staticmethod
+    def _parse_tasks(tasks):
+        return tuple(ClockifyTask(id=task['id'], name=task['name']) for task in tasks)
 
 
 
-clockify_cfg = read_config("config.json")
-clockify = Clockify(clockify_cfg)
-myprojects = clockify.get_projects()
-pprint.pprint(myprojects)
-sys.exit(1)
+_start_time = None
+# Shared by the timer functions. They run in the key handlers, so keep retry waits short.
+_session = Clockify.new_session(max_backoff=1)
 
+_cached_user_id = None  # Looked up from the API key on first use
 
-_start_time = None
+_PREFETCH_TTL = 10  # Seconds stop_timer trusts a prefetched running entry
+_prefetched = None  # (timer start time, running entries, time.monotonic() when fetched)
 
 def start_timer():
     global _start_time
@@ -117,7 +157,7 @@ def start_timer():
     url = f"{BASE_URL}/workspaces/{WORKSPACE_ID}/time-entries"
     print(payload)
     print(_start_time)
-    res = requests.post(url, headers=HEADERS, json=payload)
+    res = _session.post(url, headers=HEADERS, json=payload)
 
     if res.status_code == 201:
         print("Timer started.")
@@ -127,26 +167,49 @@ def start_timer():
 
     print(_start_time)
 
-def stop_timer():
-    global _start_time
-    print(_start_time)
-    # Get current user
-    user_res = requests.get(f"{BASE_URL}/user", headers=HEADERS)
-    if user_res.status_code != 200:
-        print("Failed to get user info.")
-        return
+def _get_running_entries():
+    """Get the current user's running time entries, or None if they couldn't be fetched"""
+    global _cached_user_id
+    # Get current user, which never changes for a given API key
+    if _cached_user_id is None:
+        user_res = _session.get(f"{BASE_URL}/user", headers=HEADERS)
+        if user_res.status_code != 200:
+            print("Failed to get user info.")
+            return None
 
-    user_id = user_res.json()["id"]
+        _cached_user_id = orjson.loads(user_res.content)["id"]
+    user_id = _cached_user_id
 
     # Get currently running time entry
     running_url = f"{BASE_URL}/workspaces/{WORKSPACE_ID}/user/{user_id}/time-entries?in-progress=true"
-    running_res = requests.get(running_url, headers=HEADERS)
+    running_res = _session.get(running_url, headers=HEADERS)
 
     if running_res.status_code != 200:
         print("Failed to get running timer.")
-        return
+        return None
+
+    return orjson.loads(running_res.content)
+
+def _prefetch_running_entries(start_time):
+    """Look up the running entry while the key is held, so stop_timer doesn't have to"""
+    global _prefetched
+    entries = _get_running_entries()
+    if entries is not None:
+        _prefetched = (start_time, entries, time.monotonic())
+
+def stop_timer():
+    global _start_time, _prefetched
+    print(_start_time)
+
+    # Use the prefetched entries if they were fetched for this timer and are still fresh
+    prefetched, _prefetched = _prefetched, None
+    if prefetched is not None and prefetched[0] == _start_time and time.monotonic() - prefetched[2] < _PREFETCH_TTL:
+        entries = prefetched[1]
+    else:
+        entries = _get_running_entries()
+        if entries is None:
+            return
 
-    entries = running_res.json()
     if not entries:
         print("No timer is running.")
         return
@@ -159,7 +222,7 @@ def stop_timer():
     stop_payload["projectId"] = "67ecf1beedf9a1136e65242c"
     stop_payload["taskId"] = "67ecf1beedf9a1136e65243a"
     print(stop_payload)
-    stop_res = requests.put(stop_url, headers=HEADERS, json=stop_payload)
+    stop_res = _session.put(stop_url, headers=HEADERS, json=stop_payload)
 
     if stop_res.status_code == 200:
         print("Timer stopped.")
@@ -175,6 +238,7 @@ def on_data_handler(data):
     if data[8] == 16:
         print(f"PRESSED :{int((data[3] - 31) / 2 + 1)}")
         start_timer()
+        threading.Thread(target=_prefetch_running_entries, args=(_start_time,), daemon=True).start()
 
     elif data[8] == 17:
         print(f"RELEASED :  {data[3]}")
@@ -185,10 +249,6 @@ def on_data_handler(data):
 
 
 def main():
-    projects()
-    print("_"*80)
-    list_active_tasks()
-    print("_"*80)
     all_devices = hid.HidDeviceFilter().get_devices()
     sayo = None
     for dev in all_devices:
@@ -204,8 +264,12 @@ def main():
 
     print("Listening to second keyboard... Press Ctrl+C to stop.")
     try:
+        # The HID reader thread does the work, so the main thread only has to stay alive.
+        # Sleep for long stretches rather than blocking on a threading.Event: time.sleep()
+        # returns as soon as Ctrl+C is pressed, whereas Event.wait() can't be interrupted
+        # on Windows.
         while True:
-            time.sleep(1)
+            time.sleep(60 * 60)
     except KeyboardInterrupt:
         print("\nExiting.")
     finally: